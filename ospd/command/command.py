@@ -32,7 +32,6 @@ from ospd.misc import valid_uuid, create_process
 from ospd.protocol import OspRequest, OspResponse
 from ospd.xml import (
     simple_response_str,
-    get_elements_from_dict,
     XmlStringHelper,
 )
 
@@ -105,10 +104,9 @@ class HelpCommand(BaseCommand):
                 'help', 200, 'OK', self._daemon.get_help_text()
             )
         elif help_format == "xml":
-            text = get_elements_from_dict(
-                {k: v.as_dict() for k, v in self._daemon.commands.items()}
+            return simple_response_str(
+                'help', 200, 'OK', self._daemon.get_help_xml()
             )
-            return simple_response_str('help', 200, 'OK', text)
 
         raise OspdCommandError('Bogus help format', 'help')
 
@@ -118,47 +116,74 @@ class GetVersion(BaseCommand):
     description = 'Return various version information'
     must_be_initialized = False
 
+    def __init__(self, daemon):
+        super().__init__(daemon)
+
+        # The last response and the versions it was built from
+        self._response = None
+
     def handle_xml(self, xml: Element) -> bytes:
         """Handles <get_version> command.
 
+        The response is built again only if one of the versions changed,
+        e.g. after a feed update.
+
         Return:
             Response string for <get_version> command.
         """
+        versions = (
+            self._daemon.get_protocol_version(),
+            self._daemon.get_daemon_name(),
+            self._daemon.get_daemon_version(),
+            self._daemon.get_scanner_name(),
+            self._daemon.get_scanner_version(),
+            self._daemon.get_vts_version(),
+        )
+
+        response = self._response
+        if response is not None and response[0] == versions:
+            return response[1]
+
+        (
+            protocol_version,
+            daemon_name,
+            daemon_version,
+            scanner_name,
+            scanner_version,
+            vts_version,
+        ) = versions
+
         protocol = Element('protocol')
 
-        for name, value in [
-            ('name', 'OSP'),
-            ('version', self._daemon.get_protocol_version()),
-        ]:
+        for name, value in [('name', 'OSP'), ('version', protocol_version)]:
             elem = SubElement(protocol, name)
             elem.text = value
 
         daemon = Element('daemon')
-        for name, value in [
-            ('name', self._daemon.get_daemon_name()),
-            ('version', self._daemon.get_daemon_version()),
-        ]:
+        for name, value in [('name', daemon_name), ('version', daemon_version)]:
             elem = SubElement(daemon, name)
             elem.text = value
 
         scanner = Element('scanner')
         for name, value in [
-            ('name', self._daemon.get_scanner_name()),
-            ('version', self._daemon.get_scanner_version()),
+            ('name', scanner_name),
+            ('version', scanner_version),
         ]:
             elem = SubElement(scanner, name)
             elem.text = value
 
         content = [protocol, daemon, scanner]
 
-        vts_version = self._daemon.get_vts_version()
         if vts_version:
             vts = Element('vts')
             elem = SubElement(vts, 'version')
             elem.text = vts_version
             content.append(vts)
 
-        return simple_response_str('get_version', 200, 'OK', content)
+        response_str = simple_response_str('get_version', 200, 'OK', content)
+        self._response = (versions, response_str)
+
+        return response_str
 
 
 GVMCG_TITLES = [
@@ -447,7 +472,7 @@ class GetScans(BaseCommand):
         progress = progress and progress == '1'
 
         responses = []
-        if scan_id in self._daemon.scan_collection.ids_iterator():
+        if self._daemon.scan_exists(scan_id):
             self._daemon.check_scan_process(scan_id)
             scan = self._daemon.get_scan_xml(
                 scan_id, details, pop_res, max_res, progress
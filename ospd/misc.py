@@ -47,33 +47,29 @@ class ResultType(object):
     ERROR = 2
     HOST_DETAIL = 3
 
+    _NAMES = {
+        ALARM: "Alarm",
+        LOG: "Log Message",
+        ERROR: "Error Message",
+        HOST_DETAIL: "Host Detail",
+    }
+    _TYPES = {name: result_type for result_type, name in _NAMES.items()}
+
     @classmethod
     def get_str(cls, result_type: int) -> str:
         """ Return string name of a result type. """
-        if result_type == cls.ALARM:
-            return "Alarm"
-        elif result_type == cls.LOG:
-            return "Log Message"
-        elif result_type == cls.ERROR:
-            return "Error Message"
-        elif result_type == cls.HOST_DETAIL:
-            return "Host Detail"
-        else:
-            assert False, "Erroneous result type {0}.".format(result_type)
+        result_name = cls._NAMES.get(result_type)
+        if result_name is None:
+            raise ValueError("Erroneous result type {0}.".format(result_type))
+        return result_name
 
     @classmethod
     def get_type(cls, result_name: str) -> int:
         """ Return string name of a result type. """
-        if result_name == "Alarm":
-            return cls.ALARM
-        elif result_name == "Log Message":
-            return cls.LOG
-        elif result_name == "Error Message":
-            return cls.ERROR
-        elif result_name == "Host Detail":
-            return cls.HOST_DETAIL
-        else:
-            assert False, "Erroneous result name {0}.".format(result_name)
+        result_type = cls._TYPES.get(result_name)
+        if result_type is None:
+            raise ValueError("Erroneous result name {0}.".format(result_name))
+        return result_type
 
 
 def valid_uuid(value) -> bool:
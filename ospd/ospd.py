@@ -26,6 +26,7 @@ import ssl
 import multiprocessing
 import time
 import os
+import threading
 
 from typing import (
     List,
@@ -43,18 +44,22 @@ import defusedxml.ElementTree as secET
 
 import psutil
 
+from lxml import etree
+
 from ospd import __version__
 from ospd.command import get_commands
 from ospd.errors import OspdCommandError
 from ospd.misc import ResultType, create_process
 from ospd.network import resolve_hostname, target_str_to_list
-from ospd.protocol import RequestParser
+from ospd.parser import DEFAULT_REQUEST_WORKERS
+from ospd.protocol import RequestParser, REQUEST_PARSER_OPTIONS
 from ospd.scan import ScanCollection, ScanStatus, ScanProgress
 from ospd.server import BaseServer, Stream
 from ospd.vtfilter import VtsFilter
 from ospd.vts import Vts
 from ospd.xml import (
     elements_as_text,
+    get_elements_from_dict,
     get_result_xml,
     get_progress_xml,
 )
@@ -65,6 +70,10 @@ PROTOCOL_VERSION = "1.2"
 
 SCHEDULER_CHECK_PERIOD = 10  # in seconds
 
+RESPONSE_BUFSIZE = 65536  # in bytes
+
+COMMAND_PARSER = etree.XMLParser(**REQUEST_PARSER_OPTIONS)
+
 BASE_SCANNER_PARAMS = {
     'debug_mode': {
         'type': 'boolean',
@@ -100,10 +109,11 @@ class OSPDaemon:
     * Implement process_scan_params and exec_scan methods which are
       specific to handling the <start_scan> command, executing the wrapped
       scanner and storing the results.
-    * Implement other methods that assert to False such as get_scanner_name,
-      get_scanner_version.
-    * Use Call set_command_attributes at init time to add scanner command
-      specific options eg. the w3af profile for w3af wrapper.
+    * Set the scanner's name, version and description in scanner_info, which
+      are returned by get_scanner_name, get_scanner_version and
+      get_scanner_description.
+    * Call set_command_attributes or set_command_elements at init time to add
+      scanner command specific options eg. the w3af profile for w3af wrapper.
     """
 
     def __init__(
@@ -115,6 +125,7 @@ class OSPDaemon:
         min_free_mem_scan_queue=0,
         file_storage_dir='/var/run/ospd',
         max_queued_scans=0,
+        request_workers=DEFAULT_REQUEST_WORKERS,
         **kwargs,
     ):  # pylint: disable=unused-argument
         """ Initializes the daemon's internal data. """
@@ -139,11 +150,20 @@ class OSPDaemon:
         self.min_free_mem_scan_queue = min_free_mem_scan_queue
         self.max_queued_scans = max_queued_scans
 
+        # Limits the amount of client commands handled at the same time
+        self._request_workers = threading.BoundedSemaphore(request_workers)
+
         self.scaninfo_store_time = kwargs.get('scaninfo_store_time')
 
+        # Results elements of the scans which are no longer running, by scan
+        # id, for get_scans requests which don't pop the results.
+        self._results_xml = {}
+
         self.protocol_version = PROTOCOL_VERSION
 
         self.commands = {}
+        self._help_text = None
+        self._help_xml = None
 
         for command_class in get_commands():
             command = command_class(self)
@@ -173,9 +193,17 @@ class OSPDaemon:
 
     def set_command_attributes(self, name: str, attributes: Dict) -> None:
         """ Sets the xml attributes of a specified command. """
-        if self.command_exists(name):
-            command = self.commands.get(name)
+        command = self.commands.get(name)
+        if command is not None:
             command.attributes = attributes
+            self.clear_help_cache()
+
+    def set_command_elements(self, name: str, elements: Dict) -> None:
+        """ Sets the xml elements of a specified command. """
+        command = self.commands.get(name)
+        if command is not None:
+            command.elements = elements
+            self.clear_help_cache()
 
     def set_scanner_param(self, name: str, scanner_params: Dict) -> None:
         """ Set a scanner parameter. """
@@ -184,6 +212,7 @@ class OSPDaemon:
         assert scanner_params
 
         self.scanner_params[name] = scanner_params
+        self.clear_help_cache()
 
     def get_scanner_params(self) -> Dict:
         return self.scanner_params
@@ -328,7 +357,7 @@ class OSPDaemon:
 
     def stop_scan(self, scan_id: str) -> None:
         if (
-            scan_id in self.scan_collection.ids_iterator()
+            self.scan_exists(scan_id)
             and self.get_scan_status(scan_id) == ScanStatus.QUEUED
         ):
             logger.info('Scan %s has been removed from the queue.', scan_id)
@@ -385,7 +414,7 @@ class OSPDaemon:
         stopping is needed."""
 
     def exec_scan(self, scan_id: str):
-        """ Asserts to False. Should be implemented by subclass. """
+        """ Raises NotImplementedError. Must be implemented by subclass. """
         raise NotImplementedError
 
     def finish_scan(self, scan_id: str) -> None:
@@ -440,7 +469,6 @@ class OSPDaemon:
 
     def get_scanner_param_type(self, param: str):
         """ Returns type of a scanner parameter. """
-        assert isinstance(param, str)
         entry = self.scanner_params.get(param)
         if not entry:
             return None
@@ -448,7 +476,6 @@ class OSPDaemon:
 
     def get_scanner_param_mandatory(self, param: str):
         """ Returns if a scanner parameter is mandatory. """
-        assert isinstance(param, str)
         entry = self.scanner_params.get(param)
         if not entry:
             return False
@@ -456,7 +483,6 @@ class OSPDaemon:
 
     def get_scanner_param_default(self, param: str):
         """ Returns default value of a scanner parameter. """
-        assert isinstance(param, str)
         entry = self.scanner_params.get(param)
         if not entry:
             return None
@@ -464,7 +490,7 @@ class OSPDaemon:
 
     def handle_client_stream(self, stream: Stream) -> None:
         """ Handles stream of data received from client. """
-        data = b''
+        data_received = False
 
         request_parser = RequestParser()
 
@@ -474,13 +500,17 @@ class OSPDaemon:
                 if not buf:
                     break
 
-                data += buf
+                data_received = True
 
                 if request_parser.has_ended(buf):
                     break
             except (AttributeError, ValueError) as message:
                 logger.error(message)
                 return
+            except etree.XMLSyntaxError as exception:
+                # Stop reading. The request is rejected as invalid below.
+                logger.debug('Invalid client data: %s', exception)
+                break
             except (ssl.SSLError) as exception:
                 logger.debug('Error: %s', exception)
                 break
@@ -488,13 +518,26 @@ class OSPDaemon:
                 logger.debug('Request timeout: %s', exception)
                 break
 
-        if len(data) <= 0:
+        if not data_received:
             logger.debug("Empty client stream")
             return
 
+        # The tree is built while reading the stream, so the received data
+        # doesn't need to be kept and parsed a second time.
+        tree = request_parser.get_root_element()
+
         response = None
         try:
-            self.handle_command(data, stream)
+            if tree is None:
+                # The stream ended before the request was complete, or the
+                # request isn't well-formed.
+                raise OspdCommandError('Invalid data')
+
+            # Only the command is handled in a worker slot. Reading the
+            # request is bounded by the stream timeout, so clients which
+            # don't send anything can't keep the others from being served.
+            with self._request_workers:
+                self.handle_xml_command(tree, stream)
         except OspdCommandError as exception:
             response = exception.as_xml()
             logger.debug('Command error: %s', exception.message)
@@ -654,35 +697,54 @@ class OSPDaemon:
         return self.scan_collection.id_exists(scan_id)
 
     def get_help_text(self) -> str:
-        """ Returns the help output in plain text format."""
+        """Returns the help output in plain text format.
+
+        The text is built once and reused until a command's attributes,
+        elements or the scanner params change.
+        """
+        if self._help_text is not None:
+            return self._help_text
 
-        txt = ''
+        txt = []
         for name, info in self.commands.items():
             description = info.get_description()
             attributes = info.get_attributes()
             elements = info.get_elements()
 
-            command_txt = "\t{0: <22} {1}\n".format(name, description)
+            txt.append(f"\t{name: <22} {description}\n")
 
             if attributes:
-                command_txt = ''.join([command_txt, "\t Attributes:\n"])
+                txt.append("\t Attributes:\n")
 
                 for attrname, attrdesc in attributes.items():
-                    attr_txt = "\t  {0: <22} {1}\n".format(attrname, attrdesc)
-                    command_txt = ''.join([command_txt, attr_txt])
+                    txt.append(f"\t  {attrname: <22} {attrdesc}\n")
 
             if elements:
-                command_txt = ''.join(
-                    [
-                        command_txt,
-                        "\t Elements:\n",
-                        elements_as_text(elements),
-                    ]
-                )
+                txt.append("\t Elements:\n")
+                txt.append(elements_as_text(elements))
+
+        self._help_text = ''.join(txt)
 
-            txt += command_txt
+        return self._help_text
 
-        return txt
+    def get_help_xml(self) -> List[Element]:
+        """Returns the help output as a list of xml elements.
+
+        The elements are built once and reused until a command's
+        attributes, elements or the scanner params change.
+        """
+        if self._help_xml is None:
+            self._help_xml = get_elements_from_dict(
+                {k: v.as_dict() for k, v in self.commands.items()}
+            )
+
+        return self._help_xml
+
+    def clear_help_cache(self) -> None:
+        """Drops the cached help output. Must be called after changing the
+        description, attributes or elements of a command."""
+        self._help_text = None
+        self._help_xml = None
 
     def delete_scan(self, scan_id: str) -> int:
         """Deletes scan_id scan from collection.
@@ -703,6 +765,8 @@ class OSPDaemon:
         if exitcode or exitcode == 0:
             del self.scan_processes[scan_id]
 
+        self._results_xml.pop(scan_id, None)
+
         return self.scan_collection.delete_scan(scan_id)
 
     def get_scan_results_xml(
@@ -710,14 +774,39 @@ class OSPDaemon:
     ):
         """Gets scan_id scan's results in XML format.
 
+        For scans which are no longer running, the element is reused
+        as long as the results are not popped and don't change.
+
         @return: String of scan results in xml.
         """
+        if pop_res:
+            self._results_xml.pop(scan_id, None)
+            cache = False
+        else:
+            cache = self.get_scan_status(scan_id) in (
+                ScanStatus.STOPPED,
+                ScanStatus.FINISHED,
+                ScanStatus.INTERRUPTED,
+            )
+
+        if cache:
+            version = self.scan_collection.get_results_version(scan_id)
+            cached = self._results_xml.get(scan_id)
+            if cached is not None and cached[0] == version:
+                logger.debug('Returning %d results', len(cached[1]))
+                return cached[1]
+
         results = Element('results')
         for result in self.scan_collection.results_iterator(
             scan_id, pop_res, max_res
         ):
             results.append(get_result_xml(result))
 
+        if cache:
+            # The version is read before the results. If the results changed
+            # in between, the element is just built again next time.
+            self._results_xml[scan_id] = (version, results)
+
         logger.debug('Returning %d results', len(results))
         return results
 
@@ -1031,57 +1120,61 @@ class OSPDaemon:
             elem = SubElement(vt_xml, name)
             elem.text = str(value)
 
+        # The fragments are parsed at once, as parsing each of them on its
+        # own sets up a new parser every time.
+        fragments = []
+
         if vt.get('vt_params'):
             params_xml_str = self.get_params_vt_as_xml_str(
                 vt_id, vt.get('vt_params')
             )
-            vt_xml.append(secET.fromstring(params_xml_str))
+            fragments.append(params_xml_str)
 
         if vt.get('vt_refs'):
             refs_xml_str = self.get_refs_vt_as_xml_str(vt_id, vt.get('vt_refs'))
-            vt_xml.append(secET.fromstring(refs_xml_str))
+            fragments.append(refs_xml_str)
 
         if vt.get('vt_dependencies'):
             dependencies = self.get_dependencies_vt_as_xml_str(
                 vt_id, vt.get('vt_dependencies')
             )
-            vt_xml.append(secET.fromstring(dependencies))
+            fragments.append(dependencies)
 
         if vt.get('creation_time'):
             vt_ctime = self.get_creation_time_vt_as_xml_str(
                 vt_id, vt.get('creation_time')
             )
-            vt_xml.append(secET.fromstring(vt_ctime))
+            fragments.append(vt_ctime)
 
         if vt.get('modification_time'):
             vt_mtime = self.get_modification_time_vt_as_xml_str(
                 vt_id, vt.get('modification_time')
             )
-            vt_xml.append(secET.fromstring(vt_mtime))
+            fragments.append(vt_mtime)
 
         if vt.get('summary'):
             summary_xml_str = self.get_summary_vt_as_xml_str(
                 vt_id, vt.get('summary')
             )
-            vt_xml.append(secET.fromstring(summary_xml_str))
+            fragments.append(summary_xml_str)
 
         if vt.get('impact'):
             impact_xml_str = self.get_impact_vt_as_xml_str(
                 vt_id, vt.get('impact')
             )
-            vt_xml.append(secET.fromstring(impact_xml_str))
+            fragments.append(impact_xml_str)
 
         if vt.get('affected'):
             affected_xml_str = self.get_affected_vt_as_xml_str(
                 vt_id, vt.get('affected')
             )
-            vt_xml.append(secET.fromstring(affected_xml_str))
+            fragments.append(affected_xml_str)
 
         if vt.get('insight'):
             insight_xml_str = self.get_insight_vt_as_xml_str(
                 vt_id, vt.get('insight')
             )
-            vt_xml.append(secET.fromstring(insight_xml_str))
+            fragments.append(insight_xml_str)
 
         if vt.get('solution'):
             solution_xml_str = self.get_solution_vt_as_xml_str(
@@ -1090,25 +1183,33 @@ class OSPDaemon:
                 vt.get('solution_type'),
                 vt.get('solution_method'),
             )
-            vt_xml.append(secET.fromstring(solution_xml_str))
+            fragments.append(solution_xml_str)
 
         if vt.get('detection') or vt.get('qod_type') or vt.get('qod'):
             detection_xml_str = self.get_detection_vt_as_xml_str(
                 vt_id, vt.get('detection'), vt.get('qod_type'), vt.get('qod')
             )
-            vt_xml.append(secET.fromstring(detection_xml_str))
+            fragments.append(detection_xml_str)
 
         if vt.get('severities'):
             severities_xml_str = self.get_severities_vt_as_xml_str(
                 vt_id, vt.get('severities')
             )
-            vt_xml.append(secET.fromstring(severities_xml_str))
+            fragments.append(severities_xml_str)
 
         if vt.get('custom'):
             custom_xml_str = self.get_custom_vt_as_xml_str(
                 vt_id, vt.get('custom')
             )
-            vt_xml.append(secET.fromstring(custom_xml_str))
+            fragments.append(custom_xml_str)
+
+        if fragments:
+            fragments_xml = secET.fromstring(
+                '<vt>{}</vt>'.format(
+                    ''.join(fragment.strip() for fragment in fragments)
+                )
+            )
+            vt_xml.extend(fragments_xml)
 
         return vt_xml
 
@@ -1146,20 +1247,36 @@ class OSPDaemon:
 
         return vts_list
 
-    def handle_command(self, data: bytes, stream: Stream) -> None:
+    def handle_command(self, data: Union[str, bytes], stream: Stream) -> None:
         """Handles an osp command in a string."""
+        if isinstance(data, str):
+            # lxml refuses str input with an encoding declaration
+            data = data.encode('utf-8')
+
         try:
-            tree = secET.fromstring(data)
-        except secET.ParseError as e:
+            tree = etree.fromstring(data, parser=COMMAND_PARSER)
+        except etree.XMLSyntaxError as e:
             logger.debug("Erroneous client input: %s", data)
             raise OspdCommandError('Invalid data') from e
 
+        self.handle_xml_command(tree, stream)
+
+    def handle_xml_command(
+        self,
+        tree: etree._Element,  # pylint: disable=protected-access
+        stream: Stream,
+    ) -> None:
+        """Handles an already parsed osp command."""
+        if tree.getroottree().docinfo.doctype:
+            logger.debug("Client input with DTD: %s", tree.tag)
+            raise OspdCommandError('Invalid data')
+
         command_name = tree.tag
 
         logger.debug('Handling %s command request.', command_name)
 
-        command = self.commands.get(command_name, None)
-        if not command and command_name != "authenticate":
+        command = self.commands.get(command_name)
+        if command is None:
             raise OspdCommandError('Bogus command name')
 
         if not self.initialized and command.must_be_initialized:
@@ -1176,20 +1293,34 @@ class OSPDaemon:
         if isinstance(response, bytes):
             write_success = stream.write(response)
         else:
+            # Coalesce the fragments of streamed responses into bigger
+            # writes instead of sending each small fragment on its own.
+            buf = bytearray()
             for data in response:
-                write_success = stream.write(data)
+                buf.extend(data)
+                if len(buf) < RESPONSE_BUFSIZE:
+                    continue
+
+                write_success = stream.write(bytes(buf))
+                buf.clear()
                 if not write_success:
                     break
 
+            if buf and write_success:
+                write_success = stream.write(bytes(buf))
+
+        if command_name != "get_scans":
+            return
+
         scan_id = tree.get('scan_id')
-        if self.scan_exists(scan_id) and command_name == "get_scans":
+        if self.scan_exists(scan_id):
             if write_success:
                 self.scan_collection.clean_temp_result_list(scan_id)
             else:
                 self.scan_collection.restore_temp_result_list(scan_id)
 
     def check(self):
-        """ Asserts to False. Should be implemented by subclass. """
+        """ Raises NotImplementedError. Must be implemented by subclass. """
         raise NotImplementedError
 
     def run(self) -> None:
@@ -1222,29 +1353,30 @@ class OSPDaemon:
         logger.info('Currently %d queued scans.', current_queued_scans)
 
         for scan_id in self.scan_collection.ids_iterator():
+            if self.get_scan_status(scan_id) != ScanStatus.QUEUED:
+                continue
+
             scan_allowed = (
                 self.is_new_scan_allowed() and self.is_enough_free_memory()
             )
-            scan_is_queued = self.get_scan_status(scan_id) == ScanStatus.QUEUED
+            if not scan_allowed:
+                return
 
-            if scan_is_queued and scan_allowed:
-                try:
-                    self.scan_collection.unpickle_scan_info(scan_id)
-                except OspdCommandError as e:
-                    logger.error("Start scan error %s", e)
-                    self.stop_scan(scan_id)
-                    continue
+            try:
+                self.scan_collection.unpickle_scan_info(scan_id)
+            except OspdCommandError as e:
+                logger.error("Start scan error %s", e)
+                self.stop_scan(scan_id)
+                continue
 
-                scan_func = self.start_scan
-                scan_process = create_process(func=scan_func, args=(scan_id,))
-                self.scan_processes[scan_id] = scan_process
-                scan_process.start()
-                self.set_scan_status(scan_id, ScanStatus.INIT)
+            scan_func = self.start_scan
+            scan_process = create_process(func=scan_func, args=(scan_id,))
+            self.scan_processes[scan_id] = scan_process
+            scan_process.start()
+            self.set_scan_status(scan_id, ScanStatus.INIT)
 
-                current_queued_scans = current_queued_scans - 1
-                logger.info('Starting scan %s.', scan_id)
-            elif scan_is_queued and not scan_allowed:
-                return
+            current_queued_scans = current_queued_scans - 1
+            logger.info('Starting scan %s.', scan_id)
 
     def is_new_scan_allowed(self) -> bool:
         """Check if max_scans has been reached.
@@ -36,6 +36,7 @@ DEFAULT_UNIX_SOCKET_PATH = "/var/run/ospd/ospd.sock"
 DEFAULT_PID_PATH = "/var/run/ospd.pid"
 DEFAULT_LOCKFILE_DIR_PATH = "/var/run/ospd"
 DEFAULT_STREAM_TIMEOUT = 10  # ten seconds
+DEFAULT_REQUEST_WORKERS = 32
 DEFAULT_SCANINFO_STORE_TIME = 0  # in hours
 DEFAULT_MAX_SCAN = 0  # 0 = disable
 DEFAULT_MIN_FREE_MEM_SCAN_QUEUE = 0  # 0 = Disable
@@ -144,6 +145,15 @@ class CliParser:
             type=int,
             help='Stream timeout. Default: %(default)s',
         )
+        parser.add_argument(
+            '--request-workers',
+            default=DEFAULT_REQUEST_WORKERS,
+            type=self.positive_int,
+            help='Max. amount of client commands handled in parallel. '
+            'Connections are still accepted and read while all workers are '
+            'busy. Their commands wait until a worker is free. '
+            'Default: %(default)s',
+        )
         parser.add_argument(
             '-l', '--log-file', help='Path to the logging file.'
         )
@@ -202,6 +212,14 @@ class CliParser:
             )
         return value
 
+    def positive_int(self, string: str) -> int:
+        """ Check if provided string is a positive integer. """
+
+        value = int(string)
+        if value < 1:
+            raise argparse.ArgumentTypeError('value must be greater than 0')
+        return value
+
     def log_level(self, string: str) -> str:
         """ Check if provided string is a valid log level. """
 
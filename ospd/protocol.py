@@ -18,17 +18,32 @@
 """ Helper classes for parsing and creating OSP XML requests and responses
 """
 
-from typing import Dict, Union, List, Any
+from typing import Dict, Union, List, Any, Optional
 
-from xml.etree.ElementTree import SubElement, Element, XMLPullParser
+from xml.etree.ElementTree import SubElement, Element
+
+from lxml import etree
 
 from ospd.errors import OspdError
 
+# Options for parsing the OSP requests. Entities, network access and huge
+# trees are disabled to keep the parsing of the client input safe and bounded.
+REQUEST_PARSER_OPTIONS = {
+    'resolve_entities': False,
+    'no_network': True,
+    'huge_tree': False,
+    'remove_comments': True,
+    'remove_pis': True,
+}
+
 
 class RequestParser:
     def __init__(self):
-        self._parser = XMLPullParser(['start', 'end'])
+        self._parser = etree.XMLPullParser(
+            events=('start', 'end'), **REQUEST_PARSER_OPTIONS
+        )
         self._root_element = None
+        self._ended = False
 
     def has_ended(self, data: bytes) -> bool:
         self._parser.feed(data)
@@ -36,11 +51,18 @@ class RequestParser:
         for event, element in self._parser.read_events():
             if event == 'start' and self._root_element is None:
                 self._root_element = element
-            elif event == 'end' and self._root_element is not None:
-                if element.tag == self._root_element.tag:
-                    return True
+            elif event == 'end' and element is self._root_element:
+                self._ended = True
+
+        return self._ended
+
+    def get_root_element(self) -> Optional[Element]:
+        """Return the parsed request once its root element has been closed,
+        otherwise None."""
+        if not self._ended:
+            return None
 
-        return False
+        return self._root_element
 
 
 class OspRequest:
@@ -141,15 +141,15 @@ class ResultList:
 
         result = OrderedDict()  # type: Dict
         result['type'] = result_type
-        result['name'] = name
-        result['severity'] = severity
-        result['test_id'] = test_id
+        result['name'] = str(name)
+        result['severity'] = str(severity)
+        result['test_id'] = str(test_id)
         result['value'] = value
-        result['host'] = host
-        result['hostname'] = hostname
-        result['port'] = port
-        result['qod'] = qod
-        result['uri'] = uri
+        result['host'] = str(host)
+        result['hostname'] = str(hostname)
+        result['port'] = str(port)
+        result['qod'] = str(qod)
+        result['uri'] = str(uri)
         self._result_list.append(result)
 
     def __iter__(self):
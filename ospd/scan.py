@@ -101,20 +101,20 @@ class ScanCollection:
 
         result = OrderedDict()  # type: Dict
         result['type'] = result_type
-        result['name'] = name
-        result['severity'] = severity
-        result['test_id'] = test_id
+        result['name'] = str(name)
+        result['severity'] = str(severity)
+        result['test_id'] = str(test_id)
         result['value'] = value
-        result['host'] = host
-        result['hostname'] = hostname
-        result['port'] = port
-        result['qod'] = qod
-        result['uri'] = uri
+        result['host'] = str(host)
+        result['hostname'] = str(hostname)
+        result['port'] = str(port)
+        result['qod'] = str(qod)
+        result['uri'] = str(uri)
         results = self.scans_table[scan_id]['results']
         results.append(result)
 
         # Set scan_info's results to propagate results to parent process.
-        self.scans_table[scan_id]['results'] = results
+        self._set_results(scan_id, results)
 
     def add_result_list(
         self, scan_id: str, result_list: Iterable[Dict[str, str]]
@@ -127,7 +127,20 @@ class ScanCollection:
         results.extend(result_list)
 
         # Set scan_info's results to propagate results to parent process.
-        self.scans_table[scan_id]['results'] = results
+        self._set_results(scan_id, results)
+
+    def _set_results(self, scan_id: str, results: List) -> None:
+        """Stores the results list of a scan together with a new results
+        version, so readers can tell whether the results have changed."""
+        self.scans_table[scan_id].update(
+            results=results, results_version=uuid.uuid4().hex
+        )
+
+    def get_results_version(self, scan_id: str) -> Optional[str]:
+        """Get a value which changes whenever the results list of the scan
+        changes. None if no results were stored yet."""
+
+        return self.scans_table[scan_id].get('results_version')
 
     def remove_hosts_from_target_progress(
         self, scan_id: str, hosts: List
@@ -200,7 +213,7 @@ class ScanCollection:
         result_aux.extend(self.scans_table[scan_id].get('temp_results', list()))
 
         # Propagate results
-        self.scans_table[scan_id]['results'] = result_aux
+        self._set_results(scan_id, result_aux)
         self.clean_temp_result_list(scan_id)
 
     def results_iterator(
@@ -214,17 +227,20 @@ class ScanCollection:
 
         max_res works only together with pop_results.
         """
+        # Every access to the scan table is a round trip to the manager
+        # process, which copies the whole list. Iterate over the local copy
+        # instead of fetching the temporary results again.
         if pop_res and max_res:
             result_aux = self.scans_table[scan_id].get('results', list())
-            self.scans_table[scan_id]['results'] = result_aux[max_res:]
-            self.scans_table[scan_id]['temp_results'] = result_aux[:max_res]
-            return iter(self.scans_table[scan_id]['temp_results'])
+            temp_results = result_aux[:max_res]
+            self._set_results(scan_id, result_aux[max_res:])
+            self.scans_table[scan_id]['temp_results'] = temp_results
+            return iter(temp_results)
         elif pop_res:
-            self.scans_table[scan_id]['temp_results'] = self.scans_table[
-                scan_id
-            ].get('results', list())
-            self.scans_table[scan_id]['results'] = list()
-            return iter(self.scans_table[scan_id]['temp_results'])
+            temp_results = self.scans_table[scan_id].get('results', list())
+            self.scans_table[scan_id]['temp_results'] = temp_results
+            self._set_results(scan_id, list())
+            return iter(temp_results)
 
         return iter(self.scans_table[scan_id]['results'])
 
@@ -385,9 +401,9 @@ class ScanCollection:
         )
 
         if finished_hosts_list and exc_hosts_list:
-            for finished in finished_hosts_list:
-                if finished in exc_hosts_list:
-                    exc_hosts_list.remove(finished)
+            # Both lists are free of duplicates, so a set difference gives
+            # the same count without scanning the list for every host.
+            return len(set(exc_hosts_list).difference(finished_hosts_list))
 
         return len(exc_hosts_list) if exc_hosts_list else 0
 
@@ -477,7 +493,7 @@ class ScanCollection:
     def id_exists(self, scan_id: str) -> bool:
         """ Check whether a scan exists in the table. """
 
-        return self.scans_table.get(scan_id) is not None
+        return scan_id in self.scans_table
 
     def delete_scan(self, scan_id: str) -> bool:
         """ Delete a scan if fully finished. """
@@ -34,7 +34,8 @@ from ospd.errors import OspdError
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_BUFSIZE = 1024
+DEFAULT_READ_BUFSIZE = 65536
+DEFAULT_REQUEST_QUEUE_SIZE = socket.SOMAXCONN
 
 
 class Stream:
@@ -53,7 +54,7 @@ class Stream:
 
         self.socket.close()
 
-    def read(self, bufsize: Optional[int] = DEFAULT_BUFSIZE) -> bytes:
+    def read(self, bufsize: Optional[int] = DEFAULT_READ_BUFSIZE) -> bytes:
         """Read at maximum bufsize data from the stream"""
         data = self.socket.recv(bufsize)
 
@@ -63,31 +64,22 @@ class Stream:
         return data
 
     def write(self, data: bytes) -> bool:
-        """Send data in chunks of DEFAULT_BUFSIZE to the client"""
-        b_start = 0
-        b_end = DEFAULT_BUFSIZE
-        ret_success = True
+        """Send all data to the client
 
-        while True:
-            if b_end > len(data):
-                try:
-                    self.socket.send(data[b_start:])
-                except (socket.error, BrokenPipeError) as e:
-                    logger.error("Error sending data to the client. %s", e)
-                    ret_success = False
-                finally:
-                    return ret_success  # pylint: disable=lost-exception
-
-            try:
-                b_sent = self.socket.send(data[b_start:b_end])
-            except (socket.error, BrokenPipeError) as e:
-                logger.error("Error sending data to the client. %s", e)
-                return False
-
-            b_start = b_end
-            b_end += b_sent
+        The data is sent in a loop instead of with sendall, so the stream
+        timeout applies to each send and not to the whole data. A client
+        which reads a large response slowly still gets all of it.
+        """
+        view = memoryview(data)
+        try:
+            while view:
+                sent = self.socket.send(view)
+                view = view[sent:]
+        except (socket.error, BrokenPipeError) as e:
+            logger.error("Error sending data to the client. %s", e)
+            return False
 
-        return ret_success
+        return True
 
 
 StreamCallbackType = Callable[[Stream], None]
@@ -171,6 +163,10 @@ class SocketServerMixin:
     # track them in the _threads list.
     daemon_threads = True
 
+    # socketserver only allows 5 pending connections by default. Use the
+    # system's limit so bursts of short OSP requests are not refused.
+    request_queue_size = DEFAULT_REQUEST_QUEUE_SIZE
+
     def __init__(self, server: BaseServer, address: Union[str, InetAddress]):
         self.server = server
         super().__init__(address, RequestHandler, bind_and_activate=True)
@@ -190,7 +186,8 @@ class ThreadedTlsSocketServer(
     SocketServerMixin,
     socketserver.ThreadingTCPServer,
 ):
-    pass
+    # Allow restarting the daemon while old connections are in TIME_WAIT
+    allow_reuse_address = True
 
 
 class UnixSocketServer(BaseServer):
@@ -266,8 +263,10 @@ class TlsServer(BaseServer):
 
         validate_cacert_file(ca_file)
 
-        protocol = ssl.PROTOCOL_SSLv23
-        self.tls_context = ssl.SSLContext(protocol)
+        # The context is created once and shared by all connections, so the
+        # certificates are only loaded at startup.
+        self.tls_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.tls_context.minimum_version = ssl.TLSVersion.TLSv1_2
         self.tls_context.verify_mode = ssl.CERT_REQUIRED
 
         self.tls_context.load_cert_chain(cert_file, keyfile=key_file)
@@ -291,6 +290,14 @@ class TlsServer(BaseServer):
     def handle_request(self, request, client_address):
         logger.debug("New connection from %s", client_address)
 
+        # Responses are small and written at once. Don't let Nagle's
+        # algorithm delay them.
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Bound the handshake too. Otherwise a client which connects and
+        # sends nothing keeps the connection and its thread forever.
+        request.settimeout(self.stream_timeout)
+
         req_socket = self.tls_context.wrap_socket(request, server_side=True)
 
         stream = Stream(req_socket, self.stream_timeout)
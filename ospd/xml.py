@@ -28,11 +28,30 @@ from xml.etree.ElementTree import tostring, Element
 from ospd.misc import ResultType
 
 
+# Characters which are not allowed in XML 1.0
+INVALID_CHARS = (
+    r'[^\x09\x0A\x0D\x20-\x7E\x85\xA0-\xFF'
+    + r'\u0100-\uD7FF\uE000-\uFDCF\uFDE0-\uFFFD]'
+)
+
 r = re.compile(  # pylint: disable=invalid-name
-    r'(.*?)(?:([^\x09\x0A\x0D\x20-\x7E\x85\xA0-\xFF'
-    + r'\u0100-\uD7FF\uE000-\uFDCF\uFDE0-\uFFFD])|([\n])|$)'
+    r'(.*?)(?:(' + INVALID_CHARS + r')|([\n])|$)'
 )
 
+invalid_char = re.compile(INVALID_CHARS)  # pylint: disable=invalid-name
+
+
+def _tostring(element: Element) -> bytes:
+    """Serializes an element to utf-8 encoded bytes.
+
+    Same output as tostring(element, encoding='utf-8'), but serializing to
+    str and encoding it at once avoids writing through a text wrapper
+    piece by piece.
+    """
+    return tostring(element, encoding='unicode').encode(
+        'utf-8', 'xmlcharrefreplace'
+    )
+
 
 def split_invalid_xml(result_text: str) -> Union[List[Union[str, int]], str]:
     """Search for occurrence of non printable chars and replace them
@@ -61,39 +80,45 @@ def escape_ctrl_chars(result_text):
     """Replace non printable chars in result_text with an hexa code
     in string format.
     """
-    escaped_str = ''
+    if not invalid_char.search(result_text):
+        return result_text
+
+    escaped = []
     for fragment in split_invalid_xml(result_text):
         if isinstance(fragment, int):
-            escaped_str += '\\x%04X' % fragment
+            escaped.append('\\x%04X' % fragment)
         else:
-            escaped_str += fragment
+            escaped.append(fragment)
 
-    return escaped_str
+    return ''.join(escaped)
 
 
 def get_result_xml(result):
     """Formats a scan result to XML format.
 
     Arguments:
-        result (dict): Dictionary with a scan result.
+        result (dict): Dictionary with a scan result. The attribute values
+            must be strings, as stored by ScanCollection.add_result and
+            ResultList.
 
     Return:
         Result as xml element object.
     """
 
-    result_xml = Element('result')
-    for name, value in [
-        ('name', result['name']),
-        ('type', ResultType.get_str(result['type'])),
-        ('severity', result['severity']),
-        ('host', result['host']),
-        ('hostname', result['hostname']),
-        ('test_id', result['test_id']),
-        ('port', result['port']),
-        ('qod', result['qod']),
-        ('uri', result['uri']),
-    ]:
-        result_xml.set(name, escape(str(value)))
+    result_xml = Element(
+        'result',
+        {
+            'name': escape(result['name']),
+            'type': ResultType.get_str(result['type']),
+            'severity': escape(result['severity']),
+            'host': escape(result['host']),
+            'hostname': escape(result['hostname']),
+            'test_id': escape(result['test_id']),
+            'port': escape(result['port']),
+            'qod': escape(result['qod']),
+            'uri': escape(result['uri']),
+        },
+    )
     if result['value'] is not None:
         result_xml.text = escape_ctrl_chars(result['value'])
 
@@ -143,10 +168,10 @@ def simple_response_str(
     Return:
         String of response in xml format.
     """
-    response = Element('%s_response' % command)
+    response = Element(f'{command}_response')
 
-    for name, value in [('status', str(status)), ('status_text', status_text)]:
-        response.set(name, escape(str(value)))
+    response.set('status', str(status))
+    response.set('status_text', escape(str(status_text)))
 
     if isinstance(content, list):
         for elem in content:
@@ -157,7 +182,7 @@ def simple_response_str(
     elif content is not None:
         response.text = escape_ctrl_chars(content)
 
-    return tostring(response, encoding='utf-8')
+    return _tostring(response)
 
 
 def get_elements_from_dict(data: Dict[str, Any]) -> List[Element]:
@@ -193,7 +218,7 @@ def elements_as_text(
 ) -> str:
     """ Returns the elements dictionary as formatted plain text. """
 
-    text = ""
+    text = []
     for elename, eledesc in elements.items():
         if isinstance(eledesc, dict):
             desc_txt = elements_as_text(eledesc, indent + 2)
@@ -201,13 +226,13 @@ def elements_as_text(
         elif isinstance(eledesc, str):
             desc_txt = ''.join([eledesc, '\n'])
         else:
-            assert False, "Only string or dictionary"
+            raise TypeError("Only string or dictionary")
 
-        ele_txt = "\t{0}{1: <22} {2}".format(' ' * indent, elename, desc_txt)
+        ele_txt = f"\t{' ' * indent}{elename: <22} {desc_txt}"
 
-        text = ''.join([text, ele_txt])
+        text.append(ele_txt)
 
-    return text
+    return ''.join(text)
 
 
 class XmlStringHelper:
@@ -226,9 +251,9 @@ class XmlStringHelper:
             Encoded string representing a part of an xml element.
         """
         if end:
-            ret = "</%s>" % elem_name
+            ret = f"</{elem_name}>"
         else:
-            ret = "<%s>" % elem_name
+            ret = f"<{elem_name}>"
 
         return ret.encode('utf-8')
 
@@ -246,9 +271,9 @@ class XmlStringHelper:
             return
 
         if end:
-            return ('</%s_response>' % command).encode('utf-8')
+            return f'</{command}_response>'.encode('utf-8')
 
-        return ('<%s_response status="200" status_text="OK">' % command).encode(
+        return f'<{command}_response status="200" status_text="OK">'.encode(
             'utf-8'
         )
 
@@ -276,10 +301,9 @@ class XmlStringHelper:
 
         if content:
             if isinstance(content, list):
-                for elem in content:
-                    xml_str = xml_str + tostring(elem, encoding='utf-8')
+                xml_str = b''.join([xml_str] + [_tostring(e) for e in content])
             elif isinstance(content, Element):
-                xml_str = xml_str + tostring(content, encoding='utf-8')
+                xml_str = xml_str + _tostring(content)
             else:
                 if end:
                     xml_str = xml_str + self.create_element(content, False)
@@ -308,6 +332,6 @@ class XmlStringHelper:
         if not value:
             value = ''
 
-        return tag[:-1] + (
-            " %s=%s>" % (attribute, quoteattr(str(value)))
-        ).encode('utf-8')
+        return tag[:-1] + f" {attribute}={quoteattr(str(value))}>".encode(
+            'utf-8'
+        )
@@ -37,6 +37,7 @@ from ospd.parser import (
     DEFAULT_UNIX_SOCKET_PATH,
     DEFAULT_PID_PATH,
     DEFAULT_LOCKFILE_DIR_PATH,
+    DEFAULT_REQUEST_WORKERS,
 )
 
 
@@ -80,6 +81,14 @@ class ArgumentParserTestCase(unittest.TestCase):
         with self.assertRaises(SystemExit):
             self.parse_args('-L blah'.split())
 
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_request_workers(self, _mock_stderr):
+        with self.assertRaises(SystemExit):
+            self.parse_args(['--request-workers=0'])
+
+        args = self.parse_args(['--request-workers=4'])
+        self.assertEqual(4, args.request_workers)
+
     def test_non_existing_key(self):
         args = self.parse_args('-k foo'.split())
         self.assertEqual('foo', args.key_file)
@@ -101,3 +110,4 @@ class ArgumentParserTestCase(unittest.TestCase):
         self.assertEqual(args.unix_socket, DEFAULT_UNIX_SOCKET_PATH)
         self.assertEqual(args.pid_file, DEFAULT_PID_PATH)
         self.assertEqual(args.lock_file_dir, DEFAULT_LOCKFILE_DIR_PATH)
+        self.assertEqual(args.request_workers, DEFAULT_REQUEST_WORKERS)
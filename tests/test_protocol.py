@@ -26,3 +26,14 @@ class RequestParserTestCase(unittest.TestCase):
         self.assertFalse(parser.has_ended(b'<foo><bar>'))
         self.assertFalse(parser.has_ended(b'</bar>'))
         self.assertTrue(parser.has_ended(b'</foo>'))
+        self.assertEqual(parser.get_root_element().tag, 'foo')
+
+    def test_parse_nested_root_tag(self):
+        parser = RequestParser()
+        self.assertFalse(parser.has_ended(b'<foo><foo/>'))
+        self.assertIsNone(parser.get_root_element())
+        self.assertTrue(parser.has_ended(b'</foo>'))
+
+        root = parser.get_root_element()
+        self.assertEqual(root.tag, 'foo')
+        self.assertEqual(len(root), 1)
@@ -28,8 +28,6 @@ from unittest.mock import patch, MagicMock, Mock
 import logging
 import xml.etree.ElementTree as ET
 
-from defusedxml.common import EntitiesForbidden
-
 from ospd.resultlist import ResultList
 from ospd.errors import OspdCommandError
 from ospd.scan import ScanStatus
@@ -117,6 +115,61 @@ class ScanTestCase(unittest.TestCase):
         self.assertEqual(response.get('status'), '200')
         self.assertEqual(response.tag, 'help_response')
 
+    def test_help_text_cache(self):
+        help_text = self.daemon.get_help_text()
+        self.assertIs(self.daemon.get_help_text(), help_text)
+
+        self.daemon.set_command_attributes(
+            'get_scans', {'foo': 'Foo description.'}
+        )
+        help_text = self.daemon.get_help_text()
+        self.assertIn('Foo description.', help_text)
+
+        self.daemon.set_scanner_param(
+            'bar', {'type': 'boolean', 'description': 'Bar description.'}
+        )
+        self.assertIn('Bar description.', self.daemon.get_help_text())
+
+        self.daemon.set_command_elements(
+            'get_scans', {'baz': 'Baz description.'}
+        )
+        self.assertIn('Baz description.', self.daemon.get_help_text())
+
+    def test_help_xml_cache(self):
+        help_xml = self.daemon.get_help_xml()
+        self.assertIs(self.daemon.get_help_xml(), help_xml)
+
+        self.daemon.set_command_attributes(
+            'get_scans', {'foo': 'Foo description.'}
+        )
+        fs = FakeStream()
+        self.daemon.handle_command('<help format="xml" />', fs)
+        response = fs.get_response()
+
+        self.assertEqual(
+            response.find('get_scans/attributes/foo').text, 'Foo description.'
+        )
+
+        self.daemon.set_command_elements(
+            'get_scans', {'baz': 'Baz description.'}
+        )
+        fs = FakeStream()
+        self.daemon.handle_command('<help format="xml" />', fs)
+        response = fs.get_response()
+
+        self.assertEqual(
+            response.find('get_scans/elements/baz').text, 'Baz description.'
+        )
+
+    def test_command_with_xml_declaration(self):
+        fs = FakeStream()
+        self.daemon.handle_command(
+            '<?xml version="1.0" encoding="UTF-8"?><get_version />', fs
+        )
+        response = fs.get_response()
+
+        self.assertEqual(response.get('status'), '200')
+
     def test_get_default_scanner_version(self):
         fs = FakeStream()
         self.daemon.handle_command('<get_version />', fs)
@@ -125,6 +178,66 @@ class ScanTestCase(unittest.TestCase):
         self.assertEqual(response.get('status'), '200')
         self.assertIsNotNone(response.find('protocol'))
 
+    def test_get_version_vts_version_changed(self):
+        fs = FakeStream()
+        self.daemon.handle_command('<get_version />', fs)
+        response = fs.get_response()
+
+        self.assertIsNone(response.find('vts'))
+
+        self.daemon.set_vts_version('today')
+
+        fs = FakeStream()
+        self.daemon.handle_command('<get_version />', fs)
+        response = fs.get_response()
+
+        self.assertEqual(response.findtext('vts/version'), 'today')
+
+    def test_handle_client_stream(self):
+        stream = Mock()
+        stream.read.side_effect = [b'<get_ver', b'sion />']
+
+        with patch.object(self.daemon, 'handle_command') as handle_command:
+            self.daemon.handle_client_stream(stream)
+
+        handle_command.assert_not_called()
+        response = ET.fromstring(stream.write.call_args[0][0])
+        self.assertEqual(response.tag, 'get_version_response')
+        self.assertEqual(response.get('status'), '200')
+        assert_called(stream.close)
+
+    def test_handle_client_stream_invalid_data(self):
+        stream = Mock()
+        stream.read.side_effect = [b'<get_version>', b'</foo>', b'more data']
+
+        self.daemon.handle_client_stream(stream)
+
+        self.assertEqual(stream.read.call_count, 2)
+        response = ET.fromstring(stream.write.call_args[0][0])
+        self.assertEqual(response.get('status'), '400')
+        self.assertEqual(response.get('status_text'), 'Invalid data')
+        assert_called(stream.close)
+
+    def test_handle_client_stream_incomplete_data(self):
+        stream = Mock()
+        stream.read.side_effect = [b'<get_version>', b'']
+
+        self.daemon.handle_client_stream(stream)
+
+        response = ET.fromstring(stream.write.call_args[0][0])
+        self.assertEqual(response.get('status'), '400')
+        self.assertEqual(response.get('status_text'), 'Invalid data')
+        assert_called(stream.close)
+
+    def test_unknown_command(self):
+        fs = FakeStream()
+
+        for cmd in ['<foo />', '<authenticate />']:
+            with self.assertRaisesRegex(OspdCommandError, 'Bogus command'):
+                self.daemon.handle_command(cmd, fs)
+
+        self.assertEqual(fs.response, b'')
+
     def test_get_vts_no_vt(self):
         fs = FakeStream()
 
@@ -134,6 +247,18 @@ class ScanTestCase(unittest.TestCase):
         self.assertEqual(response.get('status'), '200')
         self.assertIsNotNone(response.find('vts'))
 
+    def test_get_vts_coalesced_writes(self):
+        fs = FakeStream()
+        fs.write = Mock(wraps=fs.write)
+
+        self.daemon.add_vt('1.2.3.4', 'A vulnerability test')
+        self.daemon.add_vt('1.2.3.5', 'Another vulnerability test')
+        self.daemon.handle_command('<get_vts />', fs)
+        response = fs.get_response()
+
+        self.assertEqual(fs.write.call_count, 1)
+        self.assertEqual(len(response.findall('vts/vt')), 2)
+
     def test_get_vt_xml_no_dict(self):
         single_vt = ('1234', None)
         vt = self.daemon.get_vt_xml(single_vt)
@@ -692,6 +817,66 @@ class ScanTestCase(unittest.TestCase):
 
         self.assertEqual(response.findtext('scan/results/result'), None)
 
+    def test_result_attributes_as_str(self):
+        fs = FakeStream()
+        self.daemon.handle_command(
+            '<start_scan target="localhost" ports="80, 443">'
+            '<scanner_params /></start_scan>',
+            fs,
+        )
+        self.daemon.start_queued_scans()
+        response = fs.get_response()
+        scan_id = response.findtext('id')
+
+        self.daemon.add_scan_alarm(
+            scan_id, host='a', name='a', severity=5.0, qod=80
+        )
+
+        result = self.daemon.get_scan_results_xml(scan_id, False, None)[0]
+        self.assertEqual(result.get('severity'), '5.0')
+        self.assertEqual(result.get('qod'), '80')
+
+    def test_get_scan_results_xml_cache(self):
+        fs = FakeStream()
+        self.daemon.handle_command(
+            '<start_scan target="localhost" ports="80, 443">'
+            '<scanner_params /></start_scan>',
+            fs,
+        )
+        self.daemon.start_queued_scans()
+        response = fs.get_response()
+        scan_id = response.findtext('id')
+
+        self.daemon.add_scan_log(scan_id, host='a', name='a')
+
+        # Results of running scans are not cached
+        self.daemon.set_scan_status(scan_id, ScanStatus.RUNNING)
+        results = self.daemon.get_scan_results_xml(scan_id, False, None)
+        self.assertIsNot(
+            self.daemon.get_scan_results_xml(scan_id, False, None), results
+        )
+
+        self.daemon.set_scan_status(scan_id, ScanStatus.FINISHED)
+        results = self.daemon.get_scan_results_xml(scan_id, False, None)
+        self.assertEqual(len(results), 1)
+        self.assertIs(
+            self.daemon.get_scan_results_xml(scan_id, False, None), results
+        )
+
+        self.daemon.add_scan_log(scan_id, host='b', name='b')
+
+        results = self.daemon.get_scan_results_xml(scan_id, False, None)
+        self.assertEqual(len(results), 2)
+
+        popped = self.daemon.get_scan_results_xml(scan_id, True, None)
+        self.assertIsNot(popped, results)
+        self.assertEqual(len(popped), 2)
+
+        # The element of the popped results isn't returned anymore
+        empty = self.daemon.get_scan_results_xml(scan_id, False, None)
+        self.assertIsNot(empty, results)
+        self.assertEqual(len(empty), 0)
+
     def test_get_scan_pop_max_res(self):
         fs = FakeStream()
         self.daemon.handle_command(
@@ -807,9 +992,14 @@ class ScanTestCase(unittest.TestCase):
             ']>'
         )
         fs = FakeStream()
+        self.assertRaises(OspdCommandError, self.daemon.handle_command, lol, fs)
         self.assertRaises(
-            EntitiesForbidden, self.daemon.handle_command, lol, fs
+            OspdCommandError,
+            self.daemon.handle_command,
+            lol + '<lolz>&lol9;</lolz>',
+            fs,
         )
+        self.assertEqual(fs.response, b'')
 
     def test_target_with_credentials(self):
         fs = FakeStream()
@@ -996,6 +1186,30 @@ class ScanTestCase(unittest.TestCase):
             self.daemon.scan_collection.calculate_target_progress(scan_id), 50
         )
 
+    def test_simplify_exclude_host_count(self):
+
+        fs = FakeStream()
+        self.daemon.handle_command(
+            '<start_scan parallel="2">'
+            '<scanner_params />'
+            '<targets><target>'
+            '<hosts>192.168.0.0/24</hosts>'
+            '<ports>22</ports>'
+            '<exclude_hosts>192.168.0.1-10</exclude_hosts>'
+            '<finished_hosts>192.168.0.1-5,192.168.0.20</finished_hosts>'
+            '</target></targets>'
+            '</start_scan>',
+            fs,
+        )
+        self.daemon.start_queued_scans()
+        response = fs.get_response()
+
+        scan_id = response.findtext('id')
+
+        self.assertEqual(
+            self.daemon.scan_collection.simplify_exclude_host_count(scan_id), 5
+        )
+
     def test_progress_all_host_dead(self):
 
         fs = FakeStream()
@@ -0,0 +1,142 @@
+# Copyright (C) 2014-2020 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+""" Test module for the socket servers and streams.
+"""
+
+import socket
+import tempfile
+import threading
+import unittest
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+from xml.etree import ElementTree as et
+
+from ospd.ospd import OSPDaemon
+from ospd.server import Stream, TlsServer, UnixSocketServer
+
+
+class UnixSocketServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        socket_path = Path(self.tmpdir.name) / 'test.sock'
+
+        self.daemon = OSPDaemon(request_workers=1)
+        self.server = UnixSocketServer(str(socket_path), '0o700', 10)
+        self.server.start(self.daemon.handle_client_stream)
+
+    def tearDown(self):
+        self.server.close()
+        self.tmpdir.cleanup()
+
+    def connect(self):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5)
+        client.connect(str(self.server.socket_path))
+        self.addCleanup(client.close)
+        return client
+
+    @staticmethod
+    def read_response(client):
+        data = b''
+        while True:
+            buf = client.recv(1024)
+            if not buf:
+                return et.fromstring(data)
+            data += buf
+
+    def test_idle_connections(self):
+        # Clients which don't send anything don't take the only worker
+        self.connect()
+        self.connect()
+
+        client = self.connect()
+        client.sendall(b'<get_version/>')
+
+        response = self.read_response(client)
+        self.assertEqual(response.tag, 'get_version_response')
+        self.assertEqual(response.get('status'), '200')
+
+    def test_request_workers(self):
+        started = threading.Semaphore(0)
+        release = threading.Event()
+
+        def handle_xml_command(tree, stream):
+            started.release()
+            release.wait(5)
+            stream.write(b'<%s_response/>' % tree.tag.encode())
+
+        self.daemon.handle_xml_command = handle_xml_command
+
+        first = self.connect()
+        first.sendall(b'<get_version/>')
+        second = self.connect()
+        second.sendall(b'<get_version/>')
+
+        # The second command waits until the worker is free again
+        self.assertTrue(started.acquire(timeout=5))
+        self.assertFalse(started.acquire(timeout=0.5))
+
+        release.set()
+
+        self.assertTrue(started.acquire(timeout=5))
+        self.assertEqual(self.read_response(first).tag, 'get_version_response')
+        self.assertEqual(self.read_response(second).tag, 'get_version_response')
+
+
+class TlsServerTestCase(unittest.TestCase):
+    @patch('ospd.server.ssl.SSLContext')
+    @patch('ospd.server.validate_cacert_file')
+    @patch('ospd.server.Path.exists', return_value=True)
+    def test_handshake_timeout(self, _exists, _validate, _context):
+        server = TlsServer('127.0.0.1', 0, 'cert', 'key', 'ca', 10)
+        server.stream_callback = Mock()
+
+        calls = Mock()
+        server.tls_context = calls.tls_context
+
+        server.handle_request(calls.request, ('127.0.0.1', 12345))
+
+        # The timeout is set before the handshake
+        names = [name for name, _, _ in calls.mock_calls]
+        self.assertLess(
+            names.index('request.settimeout'),
+            names.index('tls_context.wrap_socket'),
+        )
+        calls.request.settimeout.assert_called_once_with(10)
+        server.stream_callback.assert_called_once()
+
+
+class StreamTestCase(unittest.TestCase):
+    def test_write(self):
+        sock = Mock()
+        sock.send.side_effect = [2, 1]
+        stream = Stream(sock, 10)
+
+        self.assertTrue(stream.write(b'foo'))
+
+        # The second send starts where the first one stopped
+        self.assertEqual(sock.send.call_count, 2)
+        self.assertEqual(bytes(sock.send.call_args[0][0]), b'o')
+
+    def test_write_error(self):
+        sock = Mock()
+        sock.send.side_effect = socket.error('Connection reset')
+        stream = Stream(sock, 10)
+
+        self.assertFalse(stream.write(b'foo'))
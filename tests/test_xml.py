@@ -66,6 +66,10 @@ class ElementsAsText(TestCase):
             '\t    consectetur            adipiscing elit\n',
         )
 
+    def test_invalid_element(self):
+        with self.assertRaises(TypeError):
+            elements_as_text({'foo': 1})
+
 
 class EscapeText(TestCase):
     def test_escape_xml_valid_text(self):
@@ -74,6 +78,12 @@ class EscapeText(TestCase):
 
         self.assertEqual(text, res)
 
+    def test_escape_xml_valid_multiline_text(self):
+        text = 'this is a valid\nmultiline\txml\r\n'
+        res = escape_ctrl_chars(text)
+
+        self.assertEqual(text, res)
+
     def test_escape_xml_invalid_char(self):
         text = 'End of transmission is not printable \x04.'
         res = escape_ctrl_chars(text)